@@ -1,9 +1,33 @@
+import argparse
+import asyncio
+import functools
+import hashlib
+import io
 import json
+import math
 import os
+import sqlite3
+import string
+import time
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+try:
+    from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+except ImportError:
+    retry = None
 from dotenv import load_dotenv
-from pptx import Presentation
-from pptx.util import Inches, Pt
 import re
+from types import SimpleNamespace
 
 # --- CONFIGURATION ---
 load_dotenv()
@@ -11,6 +35,194 @@ load_dotenv()
 
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "GEMINI")
 SEARCH_PROVIDER = os.getenv("SEARCH_PROVIDER", "TAVILY") 
+GEMINI_MODEL = "gemini-1.5-flash-latest"
+GEMINI_BATCH_MODEL = "models/gemini-1.5-flash"
+BATCH_POLL_INTERVAL_SECONDS = 30
+BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+TAVILY_SUBQUERIES = (
+    "Key information and recent developments on {topic}",
+    "{topic} overview",
+    "{topic} recent news",
+    "{topic} challenges and opportunities",
+    "{topic} future outlook",
+)
+TAVILY_RESULTS_PER_QUERY = 5
+TAVILY_MAX_CONCURRENCY = 5
+PROMPT_MAX_SENTENCES = 10
+MMR_LAMBDA = 0.7
+API_RETRY_ATTEMPTS = 3
+RETRYABLE_HTTP_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTTP_TIMEOUT_SECONDS = 60
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_ERROR_BODY_MAX_CHARS = 500
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+GEMINI_STREAM_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse"
+CACHE_ENABLED = os.getenv("SLIDES_CACHE", "1") != "0"
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "slides_gen", "cache.sqlite")
+CACHE_TTL_SECONDS = 86400
+
+# --- HTTP CLIENT ---
+_http_client = None
+
+def get_http_client():
+    """
+    Returns the process-wide httpx.AsyncClient, creating it on first use.
+    Tavily and Gemini calls share its connection pool (HTTP/2 when the 'h2' package is installed),
+    so the TCP/TLS handshake to each host is paid once per run instead of once per request.
+    """
+    global _http_client
+    if _http_client is None:
+        import httpx
+        limits = httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS)
+        try:
+            _http_client = httpx.AsyncClient(http2=True, timeout=HTTP_TIMEOUT_SECONDS, limits=limits)
+        except ImportError:
+            print("[HTTP Warning] The 'h2' package is not installed, falling back to HTTP/1.1. Install it using 'pip install httpx[http2]'.")
+            _http_client = httpx.AsyncClient(timeout=HTTP_TIMEOUT_SECONDS, limits=limits)
+    return _http_client
+
+def raise_for_status_with_body(response):
+    """
+    Like response.raise_for_status(), but appends the (truncated) response body to the error message,
+    so API explanations such as an invalid key or an unknown model are not lost. The body must already be read.
+    """
+    import httpx
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        raise httpx.HTTPStatusError(f"{e}\nResponse body: {response.text[:HTTP_ERROR_BODY_MAX_CHARS]}",
+                                    request=e.request, response=response) from None
+
+async def close_http_client():
+    """Closes the shared client; must run on the event loop that used it, so main() calls it before returning."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+# --- RETRIES ---
+def _is_transient_error(exc):
+    """True for network errors and HTTP statuses worth retrying (rate limiting, server errors)."""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in RETRYABLE_HTTP_STATUSES
+
+def retry_transient(func):
+    """
+    Retries an async API call on transient errors with exponential backoff and jitter.
+    A no-op when tenacity is not installed.
+    """
+    if retry is None:
+        return func
+    return retry(
+        stop=stop_after_attempt(API_RETRY_ATTEMPTS),
+        wait=wait_exponential_jitter(initial=1, max=10),
+        retry=retry_if_exception(_is_transient_error),
+        reraise=True,
+    )(func)
+
+# --- JSON HELPERS ---
+def json_dumps(obj, sort_keys=False):
+    """Serializes obj to a compact str with orjson when it is installed, otherwise with the stdlib json module."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode("utf-8")
+    return json.dumps(obj, sort_keys=sort_keys, ensure_ascii=False, separators=(",", ":"))
+
+def json_loads(text):
+    """Parses a JSON str or bytes with orjson when it is installed, otherwise with the stdlib json module."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# --- RESPONSE CACHE ---
+def _cache_key(func_name, args):
+    """
+    Builds a content-addressed key from the call arguments plus the active providers, model, prompt
+    and search query plan, so switching LLM_PROVIDER/SEARCH_PROVIDER or the Gemini model, or editing
+    the prompt or the Tavily sub-queries, never serves stale entries.
+    Snippet lists are sorted so the same set of snippets maps to the same key.
+    """
+    normalized_args = [sorted(arg) if isinstance(arg, list) else arg for arg in args]
+    payload = [func_name, LLM_PROVIDER, SEARCH_PROVIDER, GEMINI_MODEL,
+               SLIDE_PROMPT_PREFIX, SLIDE_PROMPT_TAIL.template, TAVILY_SUBQUERIES, TAVILY_RESULTS_PER_QUERY,
+               normalized_args]
+    return hashlib.sha256(json_dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+_cache_conn = None
+
+def _get_cache():
+    """Returns the process-wide cache connection, opening it and creating the table on first use."""
+    global _cache_conn
+    if _cache_conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH)
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created_at REAL, value TEXT)")
+        _cache_conn = conn
+    return _cache_conn
+
+def close_cache():
+    """Closes the cache connection, if one was opened."""
+    global _cache_conn
+    if _cache_conn is not None:
+        _cache_conn.close()
+        _cache_conn = None
+
+class DoNotCache:
+    """Wraps a usable but incomplete result (e.g. some sub-requests failed) that cached() returns without storing."""
+    def __init__(self, value):
+        self.value = value
+
+def _unwrap(result):
+    return result.value if isinstance(result, DoNotCache) else result
+
+def cached(ttl=CACHE_TTL_SECONDS, validate=None):
+    """
+    Caches the JSON-serializable result of an async function in a local sqlite store.
+    Empty or None results (i.e. failed API calls) and results wrapped in DoNotCache are never stored.
+    Only positional arguments form the key; keyword arguments (e.g. callbacks) are passed through.
+    validate, if given, is called on every cache hit; an entry it rejects with ValueError is treated as a miss.
+    Set SLIDES_CACHE=0 to bypass the cache entirely.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not CACHE_ENABLED:
+                return _unwrap(await func(*args, **kwargs))
+            key = _cache_key(func.__name__, args)
+            try:
+                row = _get_cache().execute("SELECT created_at, value FROM responses WHERE key = ?", (key,)).fetchone()
+                if row and time.time() - row[0] < ttl:
+                    value = json_loads(row[1])
+                    if validate is not None:
+                        validate(value)
+                    print(f"[CACHE] Hit for {func.__name__} (key {key[:12]}...). Skipping API call.")
+                    return value
+            except ValueError as e:
+                print(f"[CACHE Warning] Ignoring invalid cache entry for {func.__name__} (key {key[:12]}...): {e}")
+            except Exception as e:
+                print(f"[CACHE Warning] Could not read cache at {CACHE_PATH}: {e}")
+
+            result = await func(*args, **kwargs)
+            if isinstance(result, DoNotCache):
+                return result.value
+            if result:
+                try:
+                    conn = _get_cache()
+                    with conn:
+                        conn.execute("INSERT OR REPLACE INTO responses (key, created_at, value) VALUES (?, ?, ?)",
+                                     (key, time.time(), json_dumps(result)))
+                except Exception as e:
+                    print(f"[CACHE Warning] Could not write cache at {CACHE_PATH}: {e}")
+            return result
+        return wrapper
+    return decorator
 
 # --- 1. TOPIC INPUT ---
 def get_topic_from_user():
@@ -24,7 +236,64 @@ def get_topic_from_user():
             print("Topic cannot be empty. Please enter a valid topic.")
 
 # --- 2. WEB SEARCH ---
-def perform_web_search(topic, search_provider=SEARCH_PROVIDER):
+# Shared by every search in the process, so batch runs over many topics stay within the limit too.
+_tavily_semaphore = asyncio.Semaphore(TAVILY_MAX_CONCURRENCY)
+
+@retry_transient
+async def _call_tavily(api_key, query):
+    async with _tavily_semaphore:
+        response = await get_http_client().post(
+            TAVILY_SEARCH_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            json={"query": query, "search_depth": "basic", "max_results": TAVILY_RESULTS_PER_QUERY},
+        )
+        raise_for_status_with_body(response)
+        return json_loads(response.content)
+
+@cached()
+async def _search_with_tavily(topic):
+    """
+    Queries Tavily for the topic with several basic-depth sub-queries run concurrently, deduplicated by URL.
+    Returns a list of snippets, or None if the search could not be performed.
+    If only some sub-queries succeed, their snippets are returned but not cached.
+    """
+    search_provider = "TAVILY"
+    tavily_api_key = os.getenv("TAVILY_API_KEY")
+    if not tavily_api_key:
+        print(f"[WEB SEARCH - {search_provider} Error] TAVILY_API_KEY not found in .env file. Falling back to mock results.")
+        return None
+    try:
+        queries = [subquery.format(topic=topic) for subquery in TAVILY_SUBQUERIES]
+        print(f"[WEB SEARCH - {search_provider}] Sending {len(queries)} search queries to Tavily API...")
+        responses = await asyncio.gather(*(_call_tavily(tavily_api_key, query) for query in queries), return_exceptions=True)
+        failures = [r for r in responses if isinstance(r, Exception)]
+        if len(failures) == len(responses):
+            raise failures[0]
+        for failure in failures:
+            print(f"[WEB SEARCH - {search_provider} Warning] A search query failed: {failure}")
+        results_by_url = {}
+        for response in responses:
+            if not isinstance(response, Exception):
+                for result in response.get('results', []):
+                    results_by_url.setdefault(result['url'], result)
+        # Different URLs often carry the same syndicated text.
+        snippets = list(dict.fromkeys(result['content'] for result in results_by_url.values()))
+        print(f"[WEB SEARCH - {search_provider}] Found {len(snippets)} snippets.")
+        if not snippets:
+            print(f"[WEB SEARCH - {search_provider}] No snippets found. Returning empty list.")
+            return []
+        if failures:
+            # Retrying later may recover the missing sub-queries, so don't pin this thinner result.
+            print(f"[WEB SEARCH - {search_provider}] {len(failures)}/{len(responses)} queries failed; not caching these results.")
+            return DoNotCache(snippets)
+        return snippets
+    except ImportError:
+        print(f"[WEB SEARCH - {search_provider} Error] The 'httpx' library is not installed. Please install it using 'pip install httpx[http2]'.")
+    except Exception as e:
+        print(f"[WEB SEARCH - {search_provider} Error] Could not fetch search results: {e}")
+    return None
+
+async def perform_web_search(topic, search_provider=SEARCH_PROVIDER):
     """
     Performs a web search using the configured search provider.
     This function should return a list of relevant text snippets or summaries.
@@ -32,27 +301,9 @@ def perform_web_search(topic, search_provider=SEARCH_PROVIDER):
     print(f"\n[WEB SEARCH - Using {search_provider}] Performing web search for: \"{topic}\"...")
     
     if search_provider == "TAVILY":
-        tavily_api_key = os.getenv("TAVILY_API_KEY")
-        if tavily_api_key:
-            try:
-                from tavily import TavilyClient 
-                tavily = TavilyClient(api_key=tavily_api_key)
-                print(f"[WEB SEARCH - {search_provider}] Sending search query to Tavily API...")
-                response = tavily.search(query=f"Key information and recent developments on {topic}", search_depth="advanced", max_results=20)
-                snippets = [result['content'] for result in response.get('results', [])]
-                print(f"[WEB SEARCH - {search_provider}] Found {len(snippets)} snippets.")
-                if not snippets:
-                    print(f"[WEB SEARCH - {search_provider}] No snippets found. Returning empty list.")
-                    return []
-                return snippets
-            except ImportError:
-                print(f"[WEB SEARCH - {search_provider} Error] The 'tavily-python' library is not installed. Please install it using 'pip install tavily-python'.")
-            except Exception as e:
-                print(f"[WEB SEARCH - {search_provider} Error] Could not fetch search results: {e}")
-                
-        else:
-            print(f"[WEB SEARCH - {search_provider} Error] TAVILY_API_KEY not found in .env file. Falling back to mock results.")
-    
+        snippets = await _search_with_tavily(topic)
+        if snippets is not None:
+            return snippets
     
     print(f"[WEB SEARCH - Fallback] Using mock search results.")
     mock_results = [
@@ -64,21 +315,66 @@ def perform_web_search(topic, search_provider=SEARCH_PROVIDER):
     ]
     return mock_results
 
-# --- 3. CONTENT GENERATION WITH LLM ---
-def generate_slide_content_with_llm(topic, web_search_snippets, llm_provider=LLM_PROVIDER):
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_WORD_RE = re.compile(r'\w+')
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+""".split())
+MIN_SENTENCE_WORDS = 4
+
+def _term_vector(text):
+    """Returns (term counts, vector norm) for a bag-of-words cosine similarity."""
+    counts = Counter(word for word in _WORD_RE.findall(text.lower()) if word not in _STOPWORDS)
+    return counts, math.sqrt(sum(c * c for c in counts.values()))
+
+def _cosine_similarity(vec_a, vec_b):
+    (counts_a, norm_a), (counts_b, norm_b) = vec_a, vec_b
+    if not norm_a or not norm_b:
+        return 0.0
+    if len(counts_a) > len(counts_b):
+        counts_a, counts_b = counts_b, counts_a
+    return sum(count * counts_b[word] for word, count in counts_a.items() if word in counts_b) / (norm_a * norm_b)
+
+def select_relevant_sentences(topic, snippets, max_sentences=PROMPT_MAX_SENTENCES, mmr_lambda=MMR_LAMBDA):
     """
-    Generates slide content using an LLM.
-    The LLM should synthesize its knowledge with the web_search_snippets.
-    It MUST return a structured JSON object as defined in the prompt.
+    Condenses the web search snippets to the sentences most relevant to the topic, to keep the prompt small.
+    Sentences are picked greedily with Maximal Marginal Relevance over bag-of-words cosine similarity,
+    so the selection favours sentences about the topic while avoiding near-duplicates.
     """
-    print(f"\n[LLM - Using {llm_provider}] Generating slide content for: \"{topic}\"...")
+    sentences = list(dict.fromkeys(
+        sentence.strip()
+        for snippet in snippets
+        for sentence in _SENTENCE_SPLIT_RE.split(snippet)
+        if len(sentence.split()) >= MIN_SENTENCE_WORDS
+    ))
+    if not sentences:
+        return snippets
+    if len(sentences) <= max_sentences:
+        return sentences
 
-    prompt_template = f"""
-    You are an expert content creator tasked with generating a structured 7-slide presentation on the topic: "{topic}".
-    Incorporate your own knowledge and synthesize it with the following information from recent web search results:
-    --- WEB SEARCH SNIPPETS START ---
-    {json.dumps(web_search_snippets, indent=2)}
-    --- WEB SEARCH SNIPPETS END ---
+    topic_vector = _term_vector(topic)
+    vectors = [_term_vector(sentence) for sentence in sentences]
+    relevance = [_cosine_similarity(vector, topic_vector) for vector in vectors]
+    # Highest similarity of each candidate to anything already selected.
+    redundancy = [0.0] * len(sentences)
+    candidates = set(range(len(sentences)))
+    selected = []
+    while candidates and len(selected) < max_sentences:
+        best = max(candidates, key=lambda i: (mmr_lambda * relevance[i] - (1 - mmr_lambda) * redundancy[i], -i))
+        candidates.remove(best)
+        selected.append(best)
+        for i in candidates:
+            redundancy[i] = max(redundancy[i], _cosine_similarity(vectors[i], vectors[best]))
+
+    print(f"[WEB SEARCH] Condensed {len(snippets)} snippets ({len(sentences)} sentences) to {len(selected)} sentences for the prompt.")
+    return [sentences[i] for i in selected]
+
+# --- 3. CONTENT GENERATION WITH LLM ---
+# Everything that does not depend on the topic comes first and is byte-identical across calls,
+# so Gemini's implicit prefix caching can reuse it. Only the tail built below varies.
+SLIDE_PROMPT_PREFIX = """
+    You are an expert content creator tasked with generating a structured 7-slide presentation on the topic given under TOPIC at the end of this prompt.
+    Incorporate your own knowledge and synthesize it with the information from recent web search results given under WEB SEARCH SNIPPETS at the end of this prompt.
 
     The presentation structure MUST be as follows:
     - Slide 1: Title Slide (a compelling main title for the presentation)
@@ -91,77 +387,56 @@ def generate_slide_content_with_llm(topic, web_search_snippets, llm_provider=LLM
 
     Provide the output STRICTLY as a single JSON object adhering to the following schema. Do NOT include any explanatory text before or after the JSON object.
 
-    {{
+    {
       "slide_1_title": "string (Main Presentation Title)",
-      "slide_2_overview": {{
+      "slide_2_overview": {
         "title": "string (e.g., 'Overview', 'Executive Summary')",
         "points": ["string (Bullet Point 1)", "string (Bullet Point 2)"]
-      }},
-      "slide_3_key_point_1": {{
+      },
+      "slide_3_key_point_1": {
         "title": "string (Title for Key Point 1)",
         "points": ["string (Detail A for KP1)", "string (Detail B for KP1)"]
-      }},
-      "slide_4_key_point_2": {{
+      },
+      "slide_4_key_point_2": {
         "title": "string (Title for Key Point 2)",
         "points": ["string (Detail A for KP2)", "string (Detail B for KP2)"]
-      }},
-      "slide_5_key_point_3": {{
+      },
+      "slide_5_key_point_3": {
         "title": "string (Title for Key Point 3)",
         "points": ["string (Detail A for KP3)", "string (Detail B for KP3)"]
-      }},
-      "slide_6_key_point_4": {{
+      },
+      "slide_6_key_point_4": {
         "title": "string (Title for Key Point 4)",
         "points": ["string (Detail A for KP4)", "string (Detail B for KP4)"]
-      }},
-      "slide_7_conclusion": {{
+      },
+      "slide_7_conclusion": {
         "title": "string (e.g., 'Conclusion', 'Key Takeaways')",
         "points": ["string (Takeaway 1)", "string (Takeaway 2)"]
-      }}
-    }}
+      }
+    }
 
     Ensure all text is concise and suitable for PowerPoint slides.
     Make sure the key points are distinct and cover different aspects of the topic.
     """
 
-    # Using Google Gemini 
-    if llm_provider == "GEMINI":
-        gemini_api_key = os.getenv("GEMINI_API_KEY")
-        if gemini_api_key:
-            try:
-                import google.generativeai as genai 
-                genai.configure(api_key=gemini_api_key)
-                model = genai.GenerativeModel(
-                    'gemini-1.5-flash-latest', 
-                    generation_config=genai.types.GenerationConfig(
-                        response_mime_type="application/json" 
-                    )
-                )
-                print(f"[LLM - {llm_provider}] Sending prompt to Gemini API...")
-                response = model.generate_content(prompt_template)
-                content_json_str = response.text 
-                print(f"[LLM - {llm_provider}] Received raw response (first 100 chars): {content_json_str[:100]}...")
-                parsed_content = json.loads(content_json_str)
-                print(f"[LLM - {llm_provider}] Successfully parsed JSON content.")
-                return parsed_content
-            except ImportError:
-                print(f"[LLM - {llm_provider} Error] The 'google-generativeai' library is not installed. Please install it using 'pip install google-generativeai'.")
-            except Exception as e:
-                print(f"[LLM - {llm_provider} Error] An error occurred: {e}")
-                raw_response_text = "N/A"
-                if 'response' in locals() and hasattr(response, 'text'):
-                    raw_response_text = response.text
-                elif 'response' in locals() and hasattr(response, 'parts'):
-                    try:
-                        raw_response_text = "".join(part.text for part in response.parts)
-                    except Exception: 
-                         raw_response_text = str(response.parts)
-                print(f"[LLM - {llm_provider} Error] Raw response was: {raw_response_text[:500]}...")
-        else:
-            print(f"[LLM - {llm_provider} Error] GEMINI_API_KEY not found in .env file.")
-    
-    
-    print(f"[LLM - Fallback] API call failed for {llm_provider} or provider not configured. Using mock slide content.")
-    mock_slide_content = {
+SLIDE_PROMPT_TAIL = string.Template("""
+    TOPIC: "$topic"
+    --- WEB SEARCH SNIPPETS START ---
+    $snippets
+    --- WEB SEARCH SNIPPETS END ---
+    """)
+
+def build_slide_prompt(topic, web_search_snippets):
+    """
+    Builds the prompt asking the LLM for the 7-slide JSON structure.
+    Returns [SLIDE_PROMPT_PREFIX, tail] as separate content parts; only the tail depends on the inputs.
+    """
+    tail = SLIDE_PROMPT_TAIL.substitute(topic=topic, snippets=json_dumps(web_search_snippets))
+    return [SLIDE_PROMPT_PREFIX, tail]
+
+def get_mock_slide_content(topic):
+    """Returns placeholder slide content used whenever the LLM is unavailable."""
+    return {
         "slide_1_title": f"A Comprehensive Analysis of {topic}",
         "slide_2_overview": {
             "title": "Presentation Overview",
@@ -212,16 +487,331 @@ def generate_slide_content_with_llm(topic, web_search_snippets, llm_provider=LLM
             ]
         }
     }
-    return mock_slide_content
+
+CONTENT_SLIDE_KEYS = ("slide_2_overview", *(f"slide_{i+2}_key_point_{i}" for i in range(1, 5)), "slide_7_conclusion")
+SLIDE_KEYS = ("slide_1_title", *CONTENT_SLIDE_KEYS)
+_SLIDE_SECTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string", "minLength": 1},
+        "points": {"type": "array", "items": {"type": "string"}, "minItems": 1},
+    },
+    "required": ["title", "points"],
+}
+# Mirrors the JSON structure requested in SLIDE_PROMPT_PREFIX.
+SLIDE_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {
+        "slide_1_title": {"type": "string", "minLength": 1},
+        **{key: _SLIDE_SECTION_SCHEMA for key in CONTENT_SLIDE_KEYS},
+    },
+    "required": list(SLIDE_KEYS),
+}
+
+_CHECK_SCHEMA_TYPES = {"object": dict, "array": list, "string": str}
+_CHECK_SCHEMA_KEYWORDS = frozenset({"$schema", "type", "properties", "required", "items", "minItems", "minLength"})
+
+def _check_schema_supported(schema):
+    """
+    Raises NotImplementedError if schema uses a keyword or type _check_schema does not implement,
+    so extending SLIDE_SCHEMA can't make the fallback silently accept what fastjsonschema would reject.
+    """
+    unsupported = set(schema) - _CHECK_SCHEMA_KEYWORDS
+    if unsupported or schema.get("type") not in _CHECK_SCHEMA_TYPES:
+        raise NotImplementedError(f"Schema uses {sorted(unsupported) or schema.get('type')!r}, which the built-in "
+                                  "validator does not support. Please install fastjsonschema using 'pip install fastjsonschema'.")
+    for subschema in schema.get("properties", {}).values():
+        _check_schema_supported(subschema)
+    if "items" in schema:
+        _check_schema_supported(schema["items"])
+
+def _check_schema(schema, value, path="data"):
+    """Checks value against the subset of JSON Schema used by SLIDE_SCHEMA; raises ValueError on the first mismatch."""
+    if not isinstance(value, _CHECK_SCHEMA_TYPES[schema["type"]]):
+        raise ValueError(f"{path} must be {schema['type']}")
+    if len(value) < schema.get("minLength", schema.get("minItems", 0)):
+        raise ValueError(f"{path} must not be empty")
+    for key in schema.get("required", ()):
+        if key not in value:
+            raise ValueError(f"{path} must contain '{key}'")
+    for key, subschema in schema.get("properties", {}).items():
+        if key in value:
+            _check_schema(subschema, value[key], f"{path}.{key}")
+    for i, item in enumerate(value if "items" in schema else ()):
+        _check_schema(schema["items"], item, f"{path}[{i}]")
+
+def compile_schema(schema):
+    """
+    Returns a validator function for schema that raises ValueError on invalid data.
+    Uses code generated by fastjsonschema when it is installed, otherwise _check_schema, which
+    refuses (NotImplementedError) schemas using keywords it does not implement.
+    """
+    if fastjsonschema is not None:
+        return fastjsonschema.compile(schema)
+    _check_schema_supported(schema)
+    return functools.partial(_check_schema, schema)
+
+@functools.cache
+def _slide_validators():
+    """
+    Compiles the slide validators on first use, keeping code generation out of import time.
+    Returns (full-content validator, {key: validator for that top-level entry}); every content
+    slide shares the one compiled section validator.
+    """
+    section_validator = compile_schema(_SLIDE_SECTION_SCHEMA)
+    member_validators = {
+        "slide_1_title": compile_schema(SLIDE_SCHEMA["properties"]["slide_1_title"]),
+        **dict.fromkeys(CONTENT_SLIDE_KEYS, section_validator),
+    }
+    return compile_schema(SLIDE_SCHEMA), member_validators
+
+def validate_slide_content(content):
+    """Raises ValueError unless content matches SLIDE_SCHEMA."""
+    _slide_validators()[0](content)
+
+def _is_valid_slide_member(key, value):
+    """True if (key, value) is a well-formed top-level slide entry, so it is safe to build while streaming."""
+    validator = _slide_validators()[1].get(key)
+    if validator is None:
+        return False
+    try:
+        validator(value)
+    except ValueError:
+        return False
+    return True
+
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = " \t\n\r"
+
+def _skip_json_whitespace(text, pos):
+    while pos < len(text) and text[pos] in _JSON_WHITESPACE:
+        pos += 1
+    return pos
+
+def parse_completed_json_members(text, pos=0):
+    """
+    Incrementally parses the top-level "key": value members of a JSON object that is still being received.
+    Returns (members, new_pos): the (key, value) pairs fully contained in text after pos, and the
+    position to resume from once more text has arrived. Incomplete trailing members are left for later.
+    """
+    members = []
+    while True:
+        i = _skip_json_whitespace(text, pos)
+        if i < len(text) and text[i] in "{,":
+            i = _skip_json_whitespace(text, i + 1)
+        if i >= len(text) or text[i] == "}":
+            return members, pos
+        try:
+            key, i = _JSON_DECODER.raw_decode(text, i)
+            i = _skip_json_whitespace(text, i)
+            if i >= len(text) or text[i] != ":":
+                return members, pos
+            value, i = _JSON_DECODER.raw_decode(text, _skip_json_whitespace(text, i + 1))
+        except ValueError:
+            return members, pos
+        # A value is only complete once its terminator has arrived (e.g. numbers can still grow).
+        end = _skip_json_whitespace(text, i)
+        if end >= len(text) or text[end] not in ",}":
+            return members, pos
+        members.append((key, value))
+        pos = i
+
+@retry_transient
+async def _call_gemini(api_key, prompt_parts):
+    """Opens a streaming generateContent request and returns the (unread) httpx response."""
+    # Only opening the stream is retried; a retry after slides have been streamed would repeat them.
+    client = get_http_client()
+    request = client.build_request(
+        "POST",
+        GEMINI_STREAM_URL.format(model=GEMINI_MODEL),
+        headers={"x-goog-api-key": api_key},
+        json={
+            "contents": [{"role": "user", "parts": [{"text": part} for part in prompt_parts]}],
+            "generationConfig": {"responseMimeType": "application/json"},
+        },
+    )
+    response = await client.send(request, stream=True)
+    if response.is_error:
+        await response.aread()
+        await response.aclose()
+        raise_for_status_with_body(response)
+    return response
+
+@cached(validate=validate_slide_content)
+async def _generate_with_gemini(topic, web_search_snippets, on_slide=None):
+    """
+    Asks Gemini for the slide JSON, streaming the response.
+    If on_slide is given it is called with (key, value) for each top-level slide entry as soon as it
+    has been fully received and validated. Returns the parsed content, or None if the call failed or
+    the response does not match SLIDE_SCHEMA.
+    """
+    llm_provider = "GEMINI"
+    gemini_api_key = os.getenv("GEMINI_API_KEY")
+    if not gemini_api_key:
+        print(f"[LLM - {llm_provider} Error] GEMINI_API_KEY not found in .env file.")
+        return None
+    prompt_parts = build_slide_prompt(topic, web_search_snippets)
+    prompt_feedback = None
+    content_json_str = ""
+    try:
+        print(f"[LLM - {llm_provider}] Sending prompt to Gemini API (streaming)...")
+        response = await _call_gemini(gemini_api_key, prompt_parts)
+        parse_pos = 0
+        try:
+            # Server-sent events; each "data:" line is one GenerateContentResponse chunk.
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json_loads(line[len("data:"):])
+                prompt_feedback = event.get("promptFeedback", prompt_feedback)
+                for candidate in event.get("candidates", [])[:1]:
+                    content_json_str += "".join(part.get("text", "") for part in candidate.get("content", {}).get("parts", []))
+                if on_slide:
+                    members, parse_pos = parse_completed_json_members(content_json_str, parse_pos)
+                    for key, value in members:
+                        if _is_valid_slide_member(key, value):
+                            on_slide(key, value)
+        finally:
+            await response.aclose()
+        if not content_json_str:
+            raise ValueError("Gemini returned no content.")
+        print(f"[LLM - {llm_provider}] Received raw response (first 100 chars): {content_json_str[:100]}...")
+        parsed_content = json_loads(content_json_str)
+        validate_slide_content(parsed_content)
+        print(f"[LLM - {llm_provider}] Successfully parsed and validated JSON content.")
+        return parsed_content
+    except ImportError:
+        print(f"[LLM - {llm_provider} Error] The 'httpx' library is not installed. Please install it using 'pip install httpx[http2]'.")
+    except Exception as e:
+        print(f"[LLM - {llm_provider} Error] An error occurred: {e}")
+        # If nothing was streamed, a blocked prompt is explained by promptFeedback.
+        raw_response_text = content_json_str or str(prompt_feedback or "") or "N/A"
+        print(f"[LLM - {llm_provider} Error] Raw response was: {raw_response_text[:500]}...")
+    return None
+
+async def generate_slide_content_with_llm(topic, web_search_snippets, llm_provider=LLM_PROVIDER, on_slide=None):
+    """
+    Generates slide content using an LLM.
+    The LLM should synthesize its knowledge with the web_search_snippets.
+    It MUST return a structured JSON object as defined in the prompt.
+    on_slide, if given, receives each slide entry as it streams in (see stream_slides_into).
+    """
+    print(f"\n[LLM - Using {llm_provider}] Generating slide content for: \"{topic}\"...")
+
+    # Using Google Gemini 
+    if llm_provider == "GEMINI":
+        parsed_content = await _generate_with_gemini(topic, web_search_snippets, on_slide=on_slide)
+        if parsed_content is not None:
+            return parsed_content
+    
+    
+    print(f"[LLM - Fallback] API call failed for {llm_provider} or provider not configured. Using mock slide content.")
+    return get_mock_slide_content(topic)
+
+async def generate_slide_content_batch(topics, snippets_per_topic, llm_provider=LLM_PROVIDER):
+    """
+    Generates slide content for several topics in a single Gemini batch job.
+    Batch jobs are cheaper than interactive calls but can take minutes to complete,
+    so this is only used for non-interactive runs (--batch).
+    Returns a list of content dicts in the same order as topics; any topic whose
+    request fails falls back to mock slide content.
+    """
+    print(f"\n[LLM BATCH - Using {llm_provider}] Submitting {len(topics)} topics as one batch job...")
+    results = [None] * len(topics)
+
+    if llm_provider == "GEMINI":
+        gemini_api_key = os.getenv("GEMINI_API_KEY")
+        if gemini_api_key:
+            try:
+                from google import genai as genai_batch
+                client = genai_batch.Client(api_key=gemini_api_key)
+                inline_requests = [
+                    {
+                        "contents": [{"role": "user", "parts": [{"text": part} for part in build_slide_prompt(topic, snippets)]}],
+                        "config": {"response_mime_type": "application/json"},
+                    }
+                    for topic, snippets in zip(topics, snippets_per_topic)
+                ]
+                batch_job = await client.aio.batches.create(
+                    model=GEMINI_BATCH_MODEL,
+                    src=inline_requests,
+                    config={"display_name": "slides-generator-batch"},
+                )
+                print(f"[LLM BATCH - {llm_provider}] Created batch job: {batch_job.name}")
+                while batch_job.state.name not in BATCH_DONE_STATES:
+                    print(f"[LLM BATCH - {llm_provider}] Job state: {batch_job.state.name}. Waiting {BATCH_POLL_INTERVAL_SECONDS}s...")
+                    await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+                    batch_job = await client.aio.batches.get(name=batch_job.name)
+
+                if batch_job.state.name == "JOB_STATE_SUCCEEDED":
+                    for i, inline_response in enumerate(batch_job.dest.inlined_responses):
+                        if inline_response.error or not inline_response.response:
+                            print(f"[LLM BATCH - {llm_provider} Error] Request for \"{topics[i]}\" failed: {inline_response.error}")
+                            continue
+                        try:
+                            parsed_content = json_loads(inline_response.response.candidates[0].content.parts[0].text)
+                            validate_slide_content(parsed_content)
+                            results[i] = parsed_content
+                        except Exception as e:
+                            print(f"[LLM BATCH - {llm_provider} Error] Could not parse response for \"{topics[i]}\": {e}")
+                    print(f"[LLM BATCH - {llm_provider}] Parsed {sum(r is not None for r in results)}/{len(topics)} responses.")
+                else:
+                    print(f"[LLM BATCH - {llm_provider} Error] Batch job ended in state {batch_job.state.name}: {batch_job.error}")
+            except ImportError:
+                print(f"[LLM BATCH - {llm_provider} Error] The 'google-genai' library is not installed. Please install it using 'pip install google-genai'.")
+            except Exception as e:
+                print(f"[LLM BATCH - {llm_provider} Error] An error occurred: {e}")
+        else:
+            print(f"[LLM BATCH - {llm_provider} Error] GEMINI_API_KEY not found in .env file.")
+
+    for i, topic in enumerate(topics):
+        if results[i] is None:
+            print(f"[LLM BATCH - Fallback] Using mock slide content for \"{topic}\".")
+            results[i] = get_mock_slide_content(topic)
+    return results
 
 # --- 4. POWERPOINT SLIDE CREATION ---
-def create_presentation_from_content(topic_name, content_json, template_path=None):
+TITLE_SLIDE_LAYOUT_IDX = 0
+CONTENT_SLIDE_LAYOUT_IDX = 1
+SLIDE_BUILD_WORKERS = 4
+DRAWINGML_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+# One level-0 bullet, parsed once and deep-copied for every bullet on every slide. The run carries
+# no size; it inherits BULLET_FONT_SIZE from the text body's <a:lstStyle> (see _set_bullet_font_size).
+BULLET_PARAGRAPH_XML = f'<a:p xmlns:a="{DRAWINGML_NS}"><a:pPr lvl="0"/><a:r><a:rPr lang="en-US" dirty="0"/><a:t/></a:r></a:p>'
+BULLET_FONT_SIZE = "1800"  # hundredths of a point
+_BULLET_TEXT_PATH = f"{{{DRAWINGML_NS}}}r/{{{DRAWINGML_NS}}}t"
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\-.]')
+_XML_INVALID_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+# Body placeholder idx per slide layout, keyed by the layout's XML element so entries go away with the presentation.
+_body_ph_idx_cache = weakref.WeakKeyDictionary()
+
+@functools.cache
+def _get_pptx():
     """
-    Creates a PowerPoint presentation using python-pptx.
-    Populates slides with titles and bullet points from the content_json.
-    Optionally uses a template if template_path is provided.
+    Imports python-pptx on first use and returns the pieces this script needs.
+    Keeping it out of module import lets --help and the search/LLM steps start without paying for it.
+    """
+    from pptx import Presentation
+    from pptx.enum.shapes import PP_PLACEHOLDER
+    from pptx.oxml import parse_xml
+    from pptx.oxml.ns import qn
+    from pptx.oxml.xmlchemy import OxmlElement
+    from pptx.util import Inches, Pt
+    return SimpleNamespace(Presentation=Presentation, PP_PLACEHOLDER=PP_PLACEHOLDER, parse_xml=parse_xml, qn=qn, OxmlElement=OxmlElement,
+                           Inches=Inches, Pt=Pt, bullet_paragraph_template=parse_xml(BULLET_PARAGRAPH_XML),
+                           body_ph_types=frozenset({PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT}),
+                           non_body_ph_types=frozenset({PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE,
+                                                        PP_PLACEHOLDER.VERTICAL_TITLE, PP_PLACEHOLDER.DATE,
+                                                        PP_PLACEHOLDER.FOOTER, PP_PLACEHOLDER.SLIDE_NUMBER}))
+
+def load_presentation(template_path=None):
     """
-    print("\n[PPTX] Creating PowerPoint presentation...")
+    Loads the base presentation, optionally from a template if template_path is provided.
+    Kept separate so it can run in a worker thread while network calls are in flight.
+    """
+    Presentation = _get_pptx().Presentation
     try:
         if template_path and os.path.exists(template_path):
             prs = Presentation(template_path)
@@ -233,65 +823,139 @@ def create_presentation_from_content(topic_name, content_json, template_path=Non
     except Exception as e:
         print(f"[PPTX Error] Failed to load presentation or template: {e}. Using default layout.")
         prs = Presentation()
+    return prs
 
-    def add_content_slide_with_bullets(prs, slide_layout_idx, title_text, points_list):
-        """Helper function to add a content slide with a title and bullet points."""
-        try:
-            slide_layout = prs.slide_layouts[slide_layout_idx]
-        except IndexError:
-            print(f"[PPTX Warning] Slide layout index {slide_layout_idx} out of range. Using layout 1 (Title and Content).")
-            slide_layout = prs.slide_layouts[1] 
-            
-        slide = prs.slides.add_slide(slide_layout)
+def build_bullet_paragraphs(points_list):
+    """
+    Builds detached <a:p> elements, one bullet per point.
+    Touches no presentation state, so it can run in a worker thread ahead of adding the slide.
+    """
+    template = _get_pptx().bullet_paragraph_template
+    paragraphs = []
+    for point_text in points_list:
+        p = deepcopy(template)
+        p.find(_BULLET_TEXT_PATH).text = _XML_INVALID_CHARS_RE.sub("", str(point_text))
+        paragraphs.append(p)
+    return paragraphs
+
+def _set_bullet_font_size(txBody):
+    """
+    Sets BULLET_FONT_SIZE as the level-1 default run size in the text body's <a:lstStyle>,
+    so every bullet paragraph inherits it without a size on each run. Returns the <a:lstStyle> element.
+    """
+    pptx = _get_pptx()
+    qn, OxmlElement = pptx.qn, pptx.OxmlElement
+    # Children are kept in schema order: bodyPr, lstStyle, p...; defPPr, lvl1pPr...; ..., defRPr, extLst.
+    lstStyle = txBody.find(qn("a:lstStyle"))
+    if lstStyle is None:
+        lstStyle = OxmlElement("a:lstStyle")
+        txBody.insert(1 if txBody.find(qn("a:bodyPr")) is not None else 0, lstStyle)
+    lvl1pPr = lstStyle.find(qn("a:lvl1pPr"))
+    if lvl1pPr is None:
+        lvl1pPr = OxmlElement("a:lvl1pPr")
+        lstStyle.insert(1 if lstStyle.find(qn("a:defPPr")) is not None else 0, lvl1pPr)
+    defRPr = lvl1pPr.find(qn("a:defRPr"))
+    if defRPr is None:
+        defRPr = OxmlElement("a:defRPr")
+        extLst = lvl1pPr.find(qn("a:extLst"))
+        if extLst is not None:
+            extLst.addprevious(defRPr)
+        else:
+            lvl1pPr.append(defRPr)
+    defRPr.set("sz", BULLET_FONT_SIZE)
+    return lstStyle
+
+def set_bullet_paragraphs(tf, points_list, paragraphs=None):
+    """
+    Replaces all paragraphs of the text frame with one bullet per point.
+    Builds the <a:p> elements directly instead of going through add_paragraph()/.text/.font per bullet.
+    paragraphs, if given, are already built by build_bullet_paragraphs(points_list).
+    """
+    if paragraphs is None:
+        paragraphs = build_bullet_paragraphs(points_list)
+    if not paragraphs:
+        paragraphs = [_get_pptx().OxmlElement("a:p")]
+    txBody = tf._txBody
+    lstStyle = _set_bullet_font_size(txBody)
+    # <a:p> elements are the only children after <a:lstStyle>, so one slice assignment swaps them all.
+    txBody[txBody.index(lstStyle) + 1:] = paragraphs
+
+def _find_body_ph_idx(slide_layout):
+    """
+    Returns the idx of the placeholder that should hold the bullets on slides using slide_layout,
+    or None if it has none. The layout is scanned only the first time it is seen.
+    Prefers the lowest-idx BODY/OBJECT placeholder, otherwise any other text placeholder that is
+    not a title, date, footer or slide number.
+    """
+    if slide_layout.element in _body_ph_idx_cache:
+        return _body_ph_idx_cache[slide_layout.element]
+    pptx = _get_pptx()
+    body_ph_idx = fallback_ph_idx = None
+    for shape in slide_layout.placeholders:
+        ph_format = shape.placeholder_format
+        if ph_format.type in pptx.body_ph_types:
+            if body_ph_idx is None or ph_format.idx < body_ph_idx:
+                body_ph_idx = ph_format.idx
+        elif fallback_ph_idx is None and ph_format.type not in pptx.non_body_ph_types and shape.has_text_frame:
+            fallback_ph_idx = ph_format.idx
+    if body_ph_idx is None:
+        body_ph_idx = fallback_ph_idx
+    _body_ph_idx_cache[slide_layout.element] = body_ph_idx
+    return body_ph_idx
+
+def _body_placeholder(slide, slide_layout):
+    """Returns the bullet placeholder on slide (created from slide_layout), or None."""
+    body_ph_idx = _find_body_ph_idx(slide_layout)
+    if body_ph_idx is None:
+        return None
+    try:
+        return slide.placeholders[body_ph_idx]
+    except KeyError:
+        return None
+
+def add_content_slide_with_bullets(prs, slide_layout_idx, title_text, points_list, paragraphs=None):
+    """
+    Helper function to add a content slide with a title and bullet points.
+    paragraphs optionally holds the bullets already built by build_bullet_paragraphs(points_list).
+    """
+    pptx = _get_pptx()
+    Inches, Pt = pptx.Inches, pptx.Pt
+    try:
+        slide_layout = prs.slide_layouts[slide_layout_idx]
+    except IndexError:
+        print(f"[PPTX Warning] Slide layout index {slide_layout_idx} out of range. Using layout 1 (Title and Content).")
+        slide_layout = prs.slide_layouts[1] 
         
-        if slide.shapes.title:
-            slide.shapes.title.text = title_text
-        else: 
-            print(f"[PPTX Warning] Slide layout for '{title_text}' might not have a dedicated title placeholder. Adding text box for title.")
-            txBox = slide.shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(9), Inches(0.8))
-            tf = txBox.text_frame
-            tf.text = title_text
-            tf.paragraphs[0].font.bold = True
-            tf.paragraphs[0].font.size = Pt(28)
-
-        body_placeholder = None
-        for shape in slide.placeholders: 
-            if shape.placeholder_format.idx == 1 or \
-               (shape.name and ("Body" in shape.name or "Content" in shape.name or "Object" in shape.name)): 
-                if shape.has_text_frame:
-                    body_placeholder = shape
-                    break
-        if not body_placeholder and slide.placeholders: 
-             for shape in slide.placeholders:
-                 if shape.has_text_frame and getattr(slide.shapes, 'title', None) != shape:
-                     body_placeholder = shape
-                     break
-
-        if body_placeholder:
-            tf = body_placeholder.text_frame
-            tf.clear() 
-            tf.word_wrap = True
-            for point_text in points_list:
-                p = tf.add_paragraph()
-                p.text = str(point_text)
-                p.level = 0 
-                p.font.size = Pt(18)
-        else: 
-            print(f"[PPTX Warning] Could not find a suitable body placeholder for slide '{title_text}'. Adding a new textbox for bullets.")
-            txBox = slide.shapes.add_textbox(Inches(0.5), Inches(1.5), Inches(8.5), Inches(5.0))
-            tf = txBox.text_frame
-            tf.word_wrap = True
-            for point_text in points_list:
-                p = tf.add_paragraph()
-                p.text = str(point_text)
-                p.level = 0
-                p.font.size = Pt(18)
-        print(f"[PPTX] Added Slide: {title_text}")
-
-    title_slide_layout_idx = 0 
-    content_slide_layout_idx = 1
-
-    slide1_title_text = content_json.get("slide_1_title", f"{topic_name} - An Overview")
+    slide = prs.slides.add_slide(slide_layout)
+    
+    if slide.shapes.title:
+        slide.shapes.title.text = title_text
+    else: 
+        print(f"[PPTX Warning] Slide layout for '{title_text}' might not have a dedicated title placeholder. Adding text box for title.")
+        txBox = slide.shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(9), Inches(0.8))
+        tf = txBox.text_frame
+        tf.text = title_text
+        tf.paragraphs[0].font.bold = True
+        tf.paragraphs[0].font.size = Pt(28)
+
+    body_placeholder = _body_placeholder(slide, slide_layout)
+
+    if body_placeholder:
+        tf = body_placeholder.text_frame
+        tf.word_wrap = True
+        set_bullet_paragraphs(tf, points_list, paragraphs)
+    else: 
+        print(f"[PPTX Warning] Could not find a suitable body placeholder for slide '{title_text}'. Adding a new textbox for bullets.")
+        txBox = slide.shapes.add_textbox(Inches(0.5), Inches(1.5), Inches(8.5), Inches(5.0))
+        tf = txBox.text_frame
+        tf.word_wrap = True
+        set_bullet_paragraphs(tf, points_list, paragraphs)
+    print(f"[PPTX] Added Slide: {title_text}")
+
+def add_title_slide(prs, topic_name, slide1_title_text):
+    """Adds the title slide, falling back to a content slide if the title layout is unusable."""
+    title_slide_layout_idx = TITLE_SLIDE_LAYOUT_IDX
+    Pt = _get_pptx().Pt
     try:
         title_slide_layout = prs.slide_layouts[title_slide_layout_idx]
         slide = prs.slides.add_slide(title_slide_layout)
@@ -316,65 +980,204 @@ def create_presentation_from_content(topic_name, content_json, template_path=Non
         print(f"[PPTX] Added Slide 1: {slide1_title_text}")
     except Exception as e: 
         print(f"[PPTX Error] Failed to create title slide using layout {title_slide_layout_idx}: {e}. Attempting fallback.")
-        add_content_slide_with_bullets(prs, content_slide_layout_idx, slide1_title_text, [f"AI-Generated Presentation on: {topic_name}"])
-
-    overview_data = content_json.get("slide_2_overview", {})
-    add_content_slide_with_bullets(prs, content_slide_layout_idx,
-                                   overview_data.get("title", "Overview"),
-                                   overview_data.get("points", ["No overview points generated."]))
-
-    for i in range(1, 5): 
-        key_point_data = content_json.get(f"slide_{i+2}_key_point_{i}", {}) 
-        add_content_slide_with_bullets(prs, content_slide_layout_idx,
-                                       key_point_data.get("title", f"Key Point {i}"),
-                                       key_point_data.get("points", [f"No points generated for Key Point {i}."]))
-        
-    conclusion_data = content_json.get("slide_7_conclusion", {})
-    add_content_slide_with_bullets(prs, content_slide_layout_idx,
-                                   conclusion_data.get("title", "Conclusion / Takeaways"),
-                                   conclusion_data.get("points", ["No conclusion points generated."]))
+        add_content_slide_with_bullets(prs, CONTENT_SLIDE_LAYOUT_IDX, slide1_title_text, [f"AI-Generated Presentation on: {topic_name}"])
 
-    clean_file_name_base = re.sub(r'[^\w\-.]', '_', topic_name.lower()) 
+def add_slide_for_key(prs, topic_name, key, content_json, paragraphs=None):
+    """Adds the slide described by content_json[key]; content_json must already match SLIDE_SCHEMA."""
+    if key == "slide_1_title":
+        add_title_slide(prs, topic_name, content_json["slide_1_title"])
+        return
+    add_content_slide_with_bullets(prs, CONTENT_SLIDE_LAYOUT_IDX, content_json[key]["title"], content_json[key]["points"], paragraphs)
+
+def _write_file_bytes(file_name, data):
+    with open(file_name, "wb") as f:
+        f.write(data)
+
+def presentation_file_name(topic_name, suffix=""):
+    """Derives the .pptx file name for topic_name; suffix (e.g. "_2") is inserted before the extension."""
+    clean_file_name_base = _UNSAFE_FILENAME_CHARS_RE.sub('_', topic_name.lower())
     if not clean_file_name_base: clean_file_name_base = "presentation"
-    file_name = f"{clean_file_name_base}_presentation.pptx"
+    return f"{clean_file_name_base}_presentation{suffix}.pptx"
+
+def unique_presentation_file_names(topics):
+    """
+    Returns one file name per topic, adding an index suffix where topics differing only in case or
+    punctuation (e.g. "AI" and "ai") would otherwise map to the same file and overwrite each other.
+    """
+    file_names = []
+    used = set()
+    for topic in topics:
+        file_name = presentation_file_name(topic)
+        index = 2
+        while file_name in used:
+            file_name = presentation_file_name(topic, f"_{index}")
+            index += 1
+        if file_name != presentation_file_name(topic):
+            print(f"[PPTX Warning] File name for \"{topic}\" collides with an earlier topic; saving as {file_name}.")
+        used.add(file_name)
+        file_names.append(file_name)
+    return file_names
+
+def save_presentation(prs, topic_name, file_name=None):
+    """
+    Saves prs as file_name, or under a name derived from topic_name. Returns the file name, or None on failure.
+    The package is serialized once in memory; the fallback file name reuses those bytes.
+    """
+    if file_name is None:
+        file_name = presentation_file_name(topic_name)
 
     try:
-        prs.save(file_name)
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        pptx_bytes = buffer.getvalue()
+    except Exception as e:
+        print(f"[PPTX Error] Failed to serialize presentation '{file_name}': {e}")
+        return None
+
+    try:
+        _write_file_bytes(file_name, pptx_bytes)
         print(f"\n[PPTX] Presentation saved successfully as: {file_name}")
         return file_name
     except Exception as e:
         print(f"[PPTX Error] Failed to save presentation '{file_name}': {e}")
         fallback_file_name = "fallback_presentation.pptx"
         try:
-            prs.save(fallback_file_name)
+            _write_file_bytes(fallback_file_name, pptx_bytes)
             print(f"[PPTX] Presentation saved with fallback name: {fallback_file_name}")
             return fallback_file_name
         except Exception as e2:
             print(f"[PPTX Error] Failed to save with fallback name either: {e2}")
             return None
 
+def create_presentation_from_content(topic_name, content_json, template_path=None, prs=None, start_index=0, file_name=None):
+    """
+    Creates a PowerPoint presentation using python-pptx.
+    Populates slides with titles and bullet points from the content_json.
+    Optionally uses a template if template_path is provided, or an already loaded prs.
+    Slides before start_index are assumed to have been added already (e.g. while streaming).
+    file_name overrides the name derived from topic_name (see save_presentation).
+    """
+    if start_index:
+        print(f"\n[PPTX] Finishing PowerPoint presentation ({start_index} slides already added while streaming)...")
+    else:
+        print("\n[PPTX] Creating PowerPoint presentation...")
+    if prs is None:
+        prs = load_presentation(template_path)
+
+    remaining_keys = SLIDE_KEYS[start_index:]
+    # Bullet XML does not depend on the presentation, so build it for every remaining slide in
+    # worker threads first; adding slides to prs itself has to stay serial and in order.
+    content_keys = [key for key in remaining_keys if key in CONTENT_SLIDE_KEYS]
+    with ThreadPoolExecutor(max_workers=SLIDE_BUILD_WORKERS) as pool:
+        prebuilt = dict(zip(content_keys, pool.map(
+            build_bullet_paragraphs, (content_json[key]["points"] for key in content_keys))))
+
+    for key in remaining_keys:
+        add_slide_for_key(prs, topic_name, key, content_json, prebuilt.get(key))
+
+    return save_presentation(prs, topic_name, file_name)
+
+def stream_slides_into(prs, topic_name):
+    """
+    Returns (on_slide, built) for building slides while the LLM response is still streaming.
+    on_slide(key, value) adds the slide as soon as it arrives, as long as it is the next one
+    in SLIDE_KEYS; built records what was added so the caller can finish the deck.
+    """
+    built = {}
+    def on_slide(key, value):
+        if len(built) < len(SLIDE_KEYS) and key == SLIDE_KEYS[len(built)]:
+            add_slide_for_key(prs, topic_name, key, {key: value})
+            built[key] = value
+    return on_slide, built
+
 # --- MAIN EXECUTION ---
-if __name__ == "__main__":
-    print("--- Automated Slide Deck Generator ---")
-    
+def read_topics_file(path):
+    """Reads one topic per line from path, skipping blank lines and '#' comments."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+async def run_batch(topics_path):
+    """Generates one presentation per topic listed in topics_path using a single LLM batch job."""
+    try:
+        topics = read_topics_file(topics_path)
+    except OSError as e:
+        print(f"[Main Error] Could not read topics file '{topics_path}': {e}. Exiting.")
+        return
+    if not topics:
+        print(f"[Main Error] No topics found in '{topics_path}'. Exiting.")
+        return
+    print(f"\n[Main] Loaded {len(topics)} topics from '{topics_path}'.")
+
+    snippets_per_topic = list(await asyncio.gather(*(perform_web_search(topic) for topic in topics)))
+    for i, topic in enumerate(topics):
+        if not snippets_per_topic[i]:
+            snippets_per_topic[i] = [f"No specific web information found for {topic}, relying on general knowledge."]
+        else:
+            snippets_per_topic[i] = select_relevant_sentences(topic, snippets_per_topic[i])
+
+    contents = await generate_slide_content_batch(topics, snippets_per_topic, llm_provider=LLM_PROVIDER)
+    file_names = unique_presentation_file_names(topics)
+    for topic, slide_content_json, file_name in zip(topics, contents, file_names):
+        presentation_file = create_presentation_from_content(topic, slide_content_json, file_name=file_name)
+        if presentation_file:
+            print(f"\nSuccessfully generated presentation: {os.path.abspath(presentation_file)}")
+        else:
+            print(f"\n[Main Error] Failed to create or save the presentation file for \"{topic}\".")
+
+async def run_interactive():
+    """Asks for a single topic and generates its presentation."""
     topic = get_topic_from_user()
-    web_snippets = perform_web_search(topic) 
+    custom_template_path = None 
+
+    # Load the template in a worker thread while the web search round-trip is in flight.
+    loop = asyncio.get_running_loop()
+    web_snippets, prs = await asyncio.gather(
+        perform_web_search(topic),
+        loop.run_in_executor(None, load_presentation, custom_template_path),
+    )
     if not web_snippets:
         print("[Main] Warning: Web search returned no snippets. LLM will rely on its own knowledge.")
         web_snippets = [f"No specific web information found for {topic}, relying on general knowledge."]
+    else:
+        web_snippets = select_relevant_sentences(topic, web_snippets)
 
-    slide_content_json = generate_slide_content_with_llm(topic, web_snippets, llm_provider=LLM_PROVIDER)
+    # Slides are added to prs while the LLM response is still streaming in.
+    on_slide, built = stream_slides_into(prs, topic)
+    slide_content_json = await generate_slide_content_with_llm(topic, web_snippets, llm_provider=LLM_PROVIDER, on_slide=on_slide)
 
     if not slide_content_json:
         print("\n[Main Error] Failed to generate slide content from LLM. Exiting.")
     else:
-        custom_template_path = None 
-        
-        presentation_file = create_presentation_from_content(topic, slide_content_json, template_path=custom_template_path)
+        if any(slide_content_json.get(key) != value for key, value in built.items()):
+            # The stream failed part-way and we fell back to other content; start the deck over.
+            print("[Main] Streamed slides do not match the final content. Rebuilding the presentation.")
+            prs = load_presentation(custom_template_path)
+            built.clear()
+        presentation_file = create_presentation_from_content(topic, slide_content_json, template_path=custom_template_path,
+                                                             prs=prs, start_index=len(built))
         
         if presentation_file:
             print(f"\nSuccessfully generated presentation: {os.path.abspath(presentation_file)}")
         else:
             print("\n[Main Error] Failed to create or save the presentation file.")
 
-    print("\n--- Script Finished ---")
\ No newline at end of file
+async def main():
+    parser = argparse.ArgumentParser(description="Automated Slide Deck Generator")
+    parser.add_argument("--batch", metavar="TOPICS_FILE",
+                        help="Generate a presentation for every topic in TOPICS_FILE (one per line) using a single LLM batch job.")
+    args = parser.parse_args()
+
+    print("--- Automated Slide Deck Generator ---")
+    try:
+        if args.batch:
+            await run_batch(args.batch)
+        else:
+            await run_interactive()
+    finally:
+        await close_http_client()
+        close_cache()
+
+    print("\n--- Script Finished ---")
+
+if __name__ == "__main__":
+    asyncio.run(main())